@@ -10,8 +10,13 @@ from .models import Session, EncryptedMetadata, EmotionSnapshot
 class SessionAdmin(admin.ModelAdmin):
     list_display = ['id', 'user', 'title', 'started_at', 'ended_at', 'is_active']
     list_filter = ['is_active', 'started_at']
+    # Don't offer the ?_facets toggle: its per-choice counts are one
+    # COUNT query per filter option
+    show_facets = admin.ShowFacets.NEVER
     search_fields = ['user__username', 'title']
     readonly_fields = ['started_at', 'ended_at', 'duration_seconds']
+    # Join the user in the changelist query instead of one lookup per row
+    list_select_related = ['user']
 
 
 @admin.register(EncryptedMetadata)
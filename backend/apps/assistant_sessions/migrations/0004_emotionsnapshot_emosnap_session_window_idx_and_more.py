@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-14 12:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant_sessions', '0003_emotionsession'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emotionsnapshot',
+            index=models.Index(fields=['session', 'window_start'], name='emosnap_session_window_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='encryptedmetadata',
+            index=models.Index(fields=['session', 'created_at'], name='encmeta_session_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['user', '-started_at'], name='sess_user_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['user', 'is_active'], name='sess_user_active_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-14 12:18
+
+import base64
+
+from django.db import migrations, models
+
+
+def backfill_blob_b64(apps, schema_editor):
+    EncryptedMetadata = apps.get_model('assistant_sessions', 'EncryptedMetadata')
+    for metadata in EncryptedMetadata.objects.only('id', 'encrypted_blob').iterator():
+        EncryptedMetadata.objects.filter(pk=metadata.pk).update(
+            encrypted_blob_b64_cached=base64.b64encode(
+                metadata.encrypted_blob
+            ).decode('ascii')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant_sessions', '0004_emotionsnapshot_emosnap_session_window_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='encryptedmetadata',
+            name='encrypted_blob_b64_cached',
+            field=models.TextField(blank=True, default='', editable=False, help_text='base64 encoding of encrypted_blob, kept in sync on save'),
+        ),
+        migrations.RunPython(backfill_blob_b64, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-14 12:19
+
+import struct
+
+from django.db import migrations, models
+
+
+# Frozen copy of models.EMOTION_KEYS at the time of this migration
+EMOTION_KEYS = (
+    'neutral', 'happiness', 'sadness', 'anger',
+    'fear', 'surprise', 'disgust', 'contempt',
+)
+EMOTION_STRUCT = struct.Struct(f'<{len(EMOTION_KEYS)}f')
+
+
+def pack_distributions(apps, schema_editor):
+    EmotionSnapshot = apps.get_model('assistant_sessions', 'EmotionSnapshot')
+    for snapshot in EmotionSnapshot.objects.only('id', 'emotion_distribution').iterator():
+        distribution = snapshot.emotion_distribution or {}
+        EmotionSnapshot.objects.filter(pk=snapshot.pk).update(
+            emotion_distribution_packed=EMOTION_STRUCT.pack(
+                *(float(distribution.get(key, 0.0)) for key in EMOTION_KEYS)
+            )
+        )
+
+
+def unpack_distributions(apps, schema_editor):
+    EmotionSnapshot = apps.get_model('assistant_sessions', 'EmotionSnapshot')
+    for snapshot in EmotionSnapshot.objects.only('id', 'emotion_distribution_packed').iterator():
+        packed = snapshot.emotion_distribution_packed
+        EmotionSnapshot.objects.filter(pk=snapshot.pk).update(
+            emotion_distribution=(
+                dict(zip(EMOTION_KEYS, EMOTION_STRUCT.unpack(bytes(packed))))
+                if packed else {}
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant_sessions', '0005_encryptedmetadata_encrypted_blob_b64_cached'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emotionsnapshot',
+            name='emotion_distribution_packed',
+            field=models.BinaryField(blank=True, help_text='Percentage breakdown of detected emotions, packed in EMOTION_KEYS order', null=True),
+        ),
+        migrations.RunPython(pack_distributions, unpack_distributions),
+        migrations.RemoveField(
+            model_name='emotionsnapshot',
+            name='emotion_distribution',
+        ),
+    ]
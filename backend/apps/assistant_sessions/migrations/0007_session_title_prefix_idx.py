@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 12:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant_sessions', '0006_emotionsnapshot_pack_distribution'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['title'], name='sess_title_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
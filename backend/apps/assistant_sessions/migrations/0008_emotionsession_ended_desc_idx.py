@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-14 12:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant_sessions', '0007_session_title_prefix_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emotionsession',
+            index=models.Index(fields=['-ended_at'], name='emosess_ended_desc_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 13:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant_sessions', '0008_emotionsession_ended_desc_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='session',
+            name='sess_title_prefix_idx',
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-14 13:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant_sessions', '0009_remove_session_title_prefix_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emotionsnapshot',
+            name='session',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='emotion_snapshots', to='assistant_sessions.session'),
+        ),
+        migrations.AlterField(
+            model_name='encryptedmetadata',
+            name='session',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='encrypted_metadata', to='assistant_sessions.session'),
+        ),
+        migrations.AlterField(
+            model_name='session',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
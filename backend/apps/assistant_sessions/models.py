@@ -8,9 +8,34 @@ PRIVACY ARCHITECTURE:
 - This ensures user emotional data remains private even if server is compromised
 """
 
+import struct
+
 from django.db import models
 from django.conf import settings
 
+from . import b64 as _b64
+
+
+# Fixed channel order for packed emotion vectors (matches the
+# client's EmotionVector). Stored as little-endian float32 values.
+EMOTION_KEYS = (
+    'neutral', 'happiness', 'sadness', 'anger',
+    'fear', 'surprise', 'disgust', 'contempt',
+)
+_EMOTION_STRUCT = struct.Struct(f'<{len(EMOTION_KEYS)}f')
+
+
+def pack_emotion_vector(distribution):
+    """Pack an {emotion: percentage} dict into EMOTION_KEYS order."""
+    return _EMOTION_STRUCT.pack(
+        *(distribution.get(key, 0.0) for key in EMOTION_KEYS)
+    )
+
+
+def unpack_emotion_vector(packed):
+    """Inverse of pack_emotion_vector()."""
+    return dict(zip(EMOTION_KEYS, _EMOTION_STRUCT.unpack(packed)))
+
 
 class Session(models.Model):
     """
@@ -23,7 +48,9 @@ class Session(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
-        related_name='sessions'
+        related_name='sessions',
+        # Covered by the leading column of sess_user_started_idx
+        db_index=False
     )
     
     # Session timing
@@ -51,6 +78,11 @@ class Session(models.Model):
         ordering = ['-started_at']
         verbose_name = 'Session'
         verbose_name_plural = 'Sessions'
+        indexes = [
+            # Per-user listing in default order, served straight from the index
+            models.Index(fields=['user', '-started_at'], name='sess_user_started_idx'),
+            models.Index(fields=['user', 'is_active'], name='sess_user_active_idx'),
+        ]
     
     def __str__(self):
         return f"Session {self.id} - {self.user.username} ({self.started_at.date()})"
@@ -87,7 +119,9 @@ class EncryptedMetadata(models.Model):
     session = models.ForeignKey(
         Session,
         on_delete=models.CASCADE,
-        related_name='encrypted_metadata'
+        related_name='encrypted_metadata',
+        # Covered by the leading column of encmeta_session_created_idx
+        db_index=False
     )
     
     # The encrypted payload (AES-GCM encrypted by client)
@@ -100,6 +134,15 @@ class EncryptedMetadata(models.Model):
         help_text='12-byte IV required for decryption'
     )
     
+    # base64 form of 'encrypted_blob', computed on save. Blobs are written
+    # once and read many times, and the API always returns them as base64.
+    encrypted_blob_b64_cached = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        help_text='base64 encoding of encrypted_blob, kept in sync on save'
+    )
+    
     # Metadata type hint (not sensitive, helps client route data)
     # e.g., 'emotion_timeline', 'topic_anchors', 'notes'
     data_type = models.CharField(
@@ -116,9 +159,33 @@ class EncryptedMetadata(models.Model):
         ordering = ['created_at']
         verbose_name = 'Encrypted Metadata'
         verbose_name_plural = 'Encrypted Metadata'
+        indexes = [
+            models.Index(fields=['session', 'created_at'], name='encmeta_session_created_idx'),
+        ]
     
     def __str__(self):
         return f"EncryptedMetadata ({self.data_type}) - Session {self.session_id}"
+    
+    def refresh_blob_b64(self):
+        """
+        Recompute 'encrypted_blob_b64_cached' from 'encrypted_blob'.
+        
+        Called by save(); bulk_create() bypasses save(), so bulk
+        writers must call this themselves.
+        """
+        self.encrypted_blob_b64_cached = _b64.b64encode(
+            self.encrypted_blob
+        ).decode('ascii')
+    
+    def save(self, *args, **kwargs):
+        """Refresh the cached base64 blob before writing."""
+        self.refresh_blob_b64()
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'encrypted_blob' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'encrypted_blob_b64_cached'}
+        
+        super().save(*args, **kwargs)
 
 
 class EmotionSnapshot(models.Model):
@@ -133,14 +200,17 @@ class EmotionSnapshot(models.Model):
     session = models.ForeignKey(
         Session,
         on_delete=models.CASCADE,
-        related_name='emotion_snapshots'
+        related_name='emotion_snapshots',
+        # Covered by the leading column of emosnap_session_window_idx
+        db_index=False
     )
     
     # Aggregated stats (averages over session window)
     dominant_emotion = models.CharField(max_length=50, blank=True)
-    emotion_distribution = models.JSONField(
-        default=dict,
-        help_text='Percentage breakdown of detected emotions'
+    emotion_distribution_packed = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text='Percentage breakdown of detected emotions, packed in EMOTION_KEYS order'
     )
     
     # Conflict detection stats
@@ -157,6 +227,9 @@ class EmotionSnapshot(models.Model):
         ordering = ['window_start']
         verbose_name = 'Emotion Snapshot'
         verbose_name_plural = 'Emotion Snapshots'
+        indexes = [
+            models.Index(fields=['session', 'window_start'], name='emosnap_session_window_idx'),
+        ]
 
 
 class EmotionSession(models.Model):
@@ -217,6 +290,10 @@ class EmotionSession(models.Model):
         ordering = ['-ended_at']
         verbose_name = 'Emotion Session'
         verbose_name_plural = 'Emotion Sessions'
+        indexes = [
+            # Lets "latest N" queries stop after N index entries
+            models.Index(fields=['-ended_at'], name='emosess_ended_desc_idx'),
+        ]
     
     def __str__(self):
         return f"EmotionSession {self.id} - {self.dominant_emotion} ({self.duration_seconds}s)"
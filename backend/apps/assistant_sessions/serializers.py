@@ -2,12 +2,45 @@
 Serializers for the Sessions app.
 """
 
-import base64
+import binascii
+import copy
+
 from rest_framework import serializers
-from .models import Session, EncryptedMetadata, EmotionSnapshot
+from .models import (
+    Session,
+    EncryptedMetadata,
+    EmotionSnapshot,
+    EMOTION_KEYS,
+    pack_emotion_vector,
+)
+from . import b64 as _b64
+
+
+class CachedFieldsMixin:
+    """
+    Cache the generated field mapping per serializer class.
+    
+    ModelSerializer rebuilds its fields from model metadata on every
+    instance, but the result only depends on the class. Build it once and
+    hand each instance its own deep copies to bind, so nested children
+    bind to the new parent and context.
+    """
+    
+    _fields_cache = {}
+    
+    def get_fields(self):
+        cls = self.__class__
+        fields = self._fields_cache.get(cls)
+        if fields is None:
+            fields = self._fields_cache[cls] = super().get_fields()
+        
+        # Deep copies: fields such as DictField, ListField and
+        # ManyRelatedField bind a child in __init__, and a shallow copy
+        # would share it (still bound to the cached original)
+        return {name: copy.deepcopy(field) for name, field in fields.items()}
 
 
-class EncryptedMetadataSerializer(serializers.ModelSerializer):
+class EncryptedMetadataSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for encrypted metadata.
     
@@ -15,48 +48,101 @@ class EncryptedMetadataSerializer(serializers.ModelSerializer):
     JSON doesn't support raw binary data.
     """
     
-    # Convert binary to base64 for JSON transport
+    # Binary fields are accepted as base64; output adds
+    # 'encrypted_blob_b64' and 'iv_b64' in to_representation()
     encrypted_blob = serializers.CharField(write_only=True)
-    encrypted_blob_b64 = serializers.SerializerMethodField(read_only=True)
     iv = serializers.CharField(write_only=True)
-    iv_b64 = serializers.SerializerMethodField(read_only=True)
     
     class Meta:
         model = EncryptedMetadata
         fields = [
-            'id', 'session', 'encrypted_blob', 'encrypted_blob_b64',
-            'iv', 'iv_b64', 'data_type', 'created_at', 'updated_at'
+            'id', 'session', 'encrypted_blob', 'iv',
+            'data_type', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
     
-    def get_encrypted_blob_b64(self, obj):
-        return base64.b64encode(obj.encrypted_blob).decode('utf-8')
-    
-    def get_iv_b64(self, obj):
-        return base64.b64encode(obj.iv).decode('utf-8')
+    def to_representation(self, instance):
+        # Encode the binary fields directly rather than through two
+        # SerializerMethodFields and their per-field attribute dispatch.
+        # base64 output is pure ASCII, so skip the UTF-8 codec.
+        data = super().to_representation(instance)
+        # The cached column is filled by save(), the bulk paths and
+        # migration 0005; encode only if it is empty
+        data['encrypted_blob_b64'] = (
+            instance.encrypted_blob_b64_cached
+            or _b64.b64encode(instance.encrypted_blob).decode('ascii')
+        )
+        data['iv_b64'] = _b64.b64encode(instance.iv).decode('ascii')
+        return data
     
     def validate_encrypted_blob(self, value):
         """Decode base64 to bytes."""
         try:
-            return base64.b64decode(value)
-        except Exception:
+            return _b64.b64decode(value, validate=True)
+        except (binascii.Error, ValueError):
             raise serializers.ValidationError("Invalid base64 encoding")
     
     def validate_iv(self, value):
-        """Decode base64 to bytes and validate length."""
+        """Validate length, then decode base64 to bytes."""
+        # 12 bytes encode to exactly 16 base64 characters with no padding,
+        # so wrong-sized IVs are rejected without decoding
+        if len(value.rstrip('=')) != 16:
+            raise serializers.ValidationError(
+                "IV must be exactly 12 bytes for AES-GCM"
+            )
+        
         try:
-            iv_bytes = base64.b64decode(value)
-            if len(iv_bytes) != 12:
-                raise serializers.ValidationError(
-                    "IV must be exactly 12 bytes for AES-GCM"
-                )
-            return iv_bytes
-        except Exception:
+            return _b64.b64decode(value, validate=True)
+        except (binascii.Error, ValueError):
             raise serializers.ValidationError("Invalid base64 encoding")
 
 
-class EmotionSnapshotSerializer(serializers.ModelSerializer):
-    """Serializer for emotion snapshots."""
+class EncryptedMetadataListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """Lightweight serializer for metadata lists (no encrypted payload)."""
+    
+    class Meta:
+        model = EncryptedMetadata
+        fields = ['id', 'session', 'data_type', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+
+class EncryptedMetadataBulkListSerializer(serializers.ListSerializer):
+    """Creates all validated items with a single bulk INSERT."""
+    
+    def create(self, validated_data):
+        objs = [EncryptedMetadata(**attrs) for attrs in validated_data]
+        for obj in objs:
+            obj.refresh_blob_b64()
+        return EncryptedMetadata.objects.bulk_create(objs, batch_size=500)
+
+
+class EncryptedMetadataBulkSerializer(EncryptedMetadataSerializer):
+    """
+    Item serializer for bulk metadata uploads to one session.
+    
+    The session comes from the URL and is passed to save(), so items
+    don't carry it and no per-item session lookup is needed.
+    """
+    
+    class Meta(EncryptedMetadataSerializer.Meta):
+        read_only_fields = ['id', 'session', 'created_at', 'updated_at']
+        list_serializer_class = EncryptedMetadataBulkListSerializer
+
+
+class EmotionSnapshotSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for emotion snapshots.
+    
+    The emotion distribution is accepted as an {emotion: percentage} dict
+    and returned as 'emotion_distribution_packed': base64 of little-endian
+    float32 values in EMOTION_KEYS order.
+    """
+    
+    emotion_distribution = serializers.DictField(
+        child=serializers.FloatField(),
+        write_only=True,
+        required=False
+    )
     
     class Meta:
         model = EmotionSnapshot
@@ -66,9 +152,33 @@ class EmotionSnapshotSerializer(serializers.ModelSerializer):
             'window_start', 'window_end', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
+    
+    def validate_emotion_distribution(self, value):
+        """Reject emotions outside the fixed packing order."""
+        unknown = set(value) - set(EMOTION_KEYS)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown emotions: {', '.join(sorted(unknown))}"
+            )
+        return value
+    
+    def validate(self, attrs):
+        if 'emotion_distribution' in attrs:
+            attrs['emotion_distribution_packed'] = pack_emotion_vector(
+                attrs.pop('emotion_distribution')
+            )
+        return attrs
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        packed = instance.emotion_distribution_packed
+        data['emotion_distribution_packed'] = (
+            _b64.b64encode(packed).decode('ascii') if packed else None
+        )
+        return data
 
 
-class SessionSerializer(serializers.ModelSerializer):
+class SessionSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Session model."""
     
     encrypted_metadata = EncryptedMetadataSerializer(many=True, read_only=True)
@@ -87,7 +197,7 @@ class SessionSerializer(serializers.ModelSerializer):
         ]
 
 
-class SessionListSerializer(serializers.ModelSerializer):
+class SessionListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for session lists (no nested data)."""
     
     class Meta:
@@ -99,7 +209,7 @@ class SessionListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'started_at', 'ended_at', 'duration_seconds']
 
 
-class SessionCreateSerializer(serializers.ModelSerializer):
+class SessionCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for creating a new session."""
     
     class Meta:
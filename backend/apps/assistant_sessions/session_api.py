@@ -10,11 +10,37 @@ Endpoints:
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
-from django.http import JsonResponse
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from .models import EmotionSession
 import json
-from datetime import datetime
+import orjson
+from ciso8601 import parse_datetime
+
+
+# Public fields returned for an emotion session
+EMOTION_SESSION_FIELDS = (
+    'id', 'started_at', 'ended_at', 'duration_seconds',
+    'dominant_emotion', 'dominant_emotion_percentage',
+    'emotion_breakdown', 'total_readings', 'average_confidence',
+    'title', 'created_at',
+)
+
+
+def _orjson_response(payload, status=200):
+    """
+    JSON response encoded with orjson.
+    
+    orjson serializes datetimes natively (ISO 8601), so rows can be
+    passed through without converting timestamps first.
+    """
+    return HttpResponse(
+        orjson.dumps(payload, option=orjson.OPT_NAIVE_UTC),
+        status=status,
+        content_type='application/json'
+    )
 
 
 @api_view(['POST'])
@@ -39,9 +65,9 @@ def save_emotion_session(request):
     try:
         data = request.data
         
-        # Parse timestamps
-        started_at = datetime.fromisoformat(data['started_at'].replace('Z', '+00:00'))
-        ended_at = datetime.fromisoformat(data['ended_at'].replace('Z', '+00:00'))
+        # Parse timestamps (ciso8601 handles the trailing 'Z' natively)
+        started_at = parse_datetime(data['started_at'])
+        ended_at = parse_datetime(data['ended_at'])
         
         session = EmotionSession.objects.create(
             user=request.user if request.user.is_authenticated else None,
@@ -56,70 +82,60 @@ def save_emotion_session(request):
             title=data.get('title', '')
         )
         
-        return JsonResponse({
+        return _orjson_response({
             'id': session.id,
             'message': 'Session saved successfully',
-            'created_at': session.created_at.isoformat()
+            'created_at': session.created_at
         }, status=201)
         
     except KeyError as e:
-        return JsonResponse({'error': f'Missing field: {e}'}, status=400)
+        return _orjson_response({'error': f'Missing field: {e}'}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _orjson_response({'error': str(e)}, status=500)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def list_emotion_sessions(request):
     """List all emotion sessions, most recent first."""
-    sessions = EmotionSession.objects.all()[:50]  # Limit to 50
-    
-    result = []
-    for s in sessions:
-        result.append({
-            'id': s.id,
-            'started_at': s.started_at.isoformat(),
-            'ended_at': s.ended_at.isoformat(),
-            'duration_seconds': s.duration_seconds,
-            'dominant_emotion': s.dominant_emotion,
-            'dominant_emotion_percentage': s.dominant_emotion_percentage,
-            'emotion_breakdown': s.emotion_breakdown,
-            'total_readings': s.total_readings,
-            'average_confidence': s.average_confidence,
-            'title': s.title,
-            'created_at': s.created_at.isoformat()
-        })
+    # Fetch plain dicts - no model instances needed for a read-only list
+    result = list(
+        EmotionSession.objects
+        .order_by('-ended_at')  # Matches emosess_ended_desc_idx
+        .values(*EMOTION_SESSION_FIELDS)[:50]  # Limit to 50
+    )
     
-    return JsonResponse({'sessions': result, 'count': len(result)})
+    return _orjson_response({'sessions': result, 'count': len(result)})
+
+
+def _latest_session_etag(request):
+    """
+    ETag for the latest session: changes only when a session is added or
+    the latest one is deleted, so polling clients get cheap 304s.
+    """
+    row = EmotionSession.objects.values('id', 'created_at').first()
+    if row is None:
+        return None
+    return f"{row['id']}-{row['created_at'].timestamp()}"
 
 
+@cache_control(private=True, max_age=1)
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@condition(etag_func=_latest_session_etag)
 def get_latest_session(request):
     """Get the most recent emotion session."""
     try:
-        session = EmotionSession.objects.first()  # Already ordered by -ended_at
+        # Already ordered by -ended_at. One query returns either a plain
+        # dict or None, so the empty case never hydrates a row.
+        session = EmotionSession.objects.values(*EMOTION_SESSION_FIELDS).first()
         
-        if not session:
-            return JsonResponse({'session': None, 'message': 'No sessions found'})
+        if session is None:
+            return _orjson_response({'session': None, 'message': 'No sessions found'})
         
-        return JsonResponse({
-            'session': {
-                'id': session.id,
-                'started_at': session.started_at.isoformat(),
-                'ended_at': session.ended_at.isoformat(),
-                'duration_seconds': session.duration_seconds,
-                'dominant_emotion': session.dominant_emotion,
-                'dominant_emotion_percentage': session.dominant_emotion_percentage,
-                'emotion_breakdown': session.emotion_breakdown,
-                'total_readings': session.total_readings,
-                'average_confidence': session.average_confidence,
-                'title': session.title,
-                'created_at': session.created_at.isoformat()
-            }
-        })
+        return _orjson_response({'session': session})
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _orjson_response({'error': str(e)}, status=500)
 
 
 @api_view(['DELETE'])
@@ -129,8 +145,8 @@ def delete_emotion_session(request, session_id):
     try:
         session = EmotionSession.objects.get(id=session_id)
         session.delete()
-        return JsonResponse({'message': 'Session deleted successfully'})
+        return _orjson_response({'message': 'Session deleted successfully'})
     except EmotionSession.DoesNotExist:
-        return JsonResponse({'error': 'Session not found'}, status=404)
+        return _orjson_response({'error': 'Session not found'}, status=404)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _orjson_response({'error': str(e)}, status=500)
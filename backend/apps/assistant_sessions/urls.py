@@ -13,8 +13,10 @@ from .session_api import (
 )
 
 router = DefaultRouter()
-router.register(r'', SessionViewSet, basename='session')
+# 'metadata' must come first: the session routes at r'' would otherwise
+# match 'metadata/' as a session detail with pk='metadata'
 router.register(r'metadata', EncryptedMetadataViewSet, basename='metadata')
+router.register(r'', SessionViewSet, basename='session')
 
 urlpatterns = [
     # Emotion Session API
@@ -6,6 +6,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 
 from .models import Session, EncryptedMetadata, EmotionSnapshot
@@ -14,6 +15,8 @@ from .serializers import (
     SessionListSerializer,
     SessionCreateSerializer,
     EncryptedMetadataSerializer,
+    EncryptedMetadataListSerializer,
+    EncryptedMetadataBulkSerializer,
     EmotionSnapshotSerializer
 )
 
@@ -30,13 +33,37 @@ class SessionViewSet(viewsets.ModelViewSet):
     - DELETE /api/sessions/{id}/ - Delete session
     - POST /api/sessions/{id}/end/ - End an active session
     - POST /api/sessions/{id}/metadata/ - Add encrypted metadata
+    - POST /api/sessions/{id}/metadata/bulk/ - Add many metadata blobs at once
     """
     
     permission_classes = [IsAuthenticated]
     
+    # Upper bound on items accepted by one metadata/bulk request
+    max_bulk_metadata = 1000
+    
+    # Actions that render the nested SessionSerializer
+    nested_actions = ('retrieve', 'update', 'partial_update', 'end')
+    
     def get_queryset(self):
         """Filter sessions to current user only."""
-        return Session.objects.filter(user=self.request.user)
+        queryset = Session.objects.filter(user=self.request.user)
+        
+        # Lists only select the columns the lightweight serializer renders
+        if self.action == 'list':
+            return queryset.only(*SessionListSerializer.Meta.fields)
+        
+        # Prefetch nested relations in one query each instead of per session.
+        # Metadata renders from the cached base64 column, so the raw blob
+        # is left unread.
+        if self.action in self.nested_actions:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'encrypted_metadata',
+                    queryset=EncryptedMetadata.objects.defer('encrypted_blob')
+                ),
+                'emotion_snapshots'
+            )
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -95,6 +122,34 @@ class SessionViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=True, methods=['post'], url_path='metadata/bulk')
+    def metadata_bulk(self, request, pk=None):
+        """
+        Add several encrypted metadata blobs to a session in one INSERT.
+        
+        POST /api/sessions/{id}/metadata/bulk/
+        
+        Body: a list of objects shaped like the metadata/ endpoint body.
+        """
+        session = self.get_object()
+        
+        if isinstance(request.data, list) and len(request.data) > self.max_bulk_metadata:
+            return Response(
+                {'error': f'At most {self.max_bulk_metadata} items per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        serializer = EncryptedMetadataBulkSerializer(data=request.data, many=True)
+        
+        if serializer.is_valid():
+            created = serializer.save(session=session)
+            return Response(
+                {'count': len(created), 'ids': [obj.id for obj in created]},
+                status=status.HTTP_201_CREATED
+            )
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
     @action(detail=True, methods=['post'])
     def snapshot(self, request, pk=None):
         """
@@ -124,10 +179,24 @@ class EncryptedMetadataViewSet(viewsets.ModelViewSet):
     """
     
     permission_classes = [IsAuthenticated]
-    serializer_class = EncryptedMetadataSerializer
     
     def get_queryset(self):
         """Filter to current user's session metadata only."""
-        return EncryptedMetadata.objects.filter(
+        queryset = EncryptedMetadata.objects.filter(
             session__user=self.request.user
         )
+        
+        # Lists don't return the payload, so leave the blob columns unread
+        if self.action == 'list':
+            queryset = queryset.defer(
+                'encrypted_blob', 'encrypted_blob_b64_cached', 'iv'
+            )
+        # Detail renders the cached base64 column, not the raw blob
+        elif self.action == 'retrieve':
+            queryset = queryset.defer('encrypted_blob')
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return EncryptedMetadataListSerializer
+        return EncryptedMetadataSerializer
@@ -5,3 +5,7 @@ class StreamConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.stream'
     verbose_name = 'Real-time Stream'
+    
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
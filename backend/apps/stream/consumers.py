@@ -12,14 +12,64 @@ All ML inference happens client-side. The server is a "dumb pipe"
 for encrypted data that it cannot read.
 """
 
-import json
+import asyncio
 import logging
+import time
+import uuid
+
+import orjson
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.db import DatabaseError, transaction
 from django.utils import timezone
 
+# Safe at module level: routing (and so this module) is imported in
+# asgi.py after get_asgi_application() has populated the app registry
+from apps.assistant_sessions import b64 as _b64
+from apps.assistant_sessions.models import EncryptedMetadata, Session
+
+from .protocol import (
+    PROTO_SUBPROTOCOL,
+    ProtocolError,
+    decode_binary_frame,
+    decode_envelope,
+    encode_frame,
+)
+
 logger = logging.getLogger(__name__)
 
+# Consumers connected to this process, by group name. Same-process peers
+# are notified directly instead of through the channel layer.
+_local_groups = {}
+# Tags layer events sent from this process (unique across hosts, unlike a pid)
+_PROCESS_ID = uuid.uuid4().hex
+# asyncio only keeps weak references to tasks; hold local deliveries here
+_local_tasks = set()
+
+# metadata.sync writes are buffered for up to METADATA_BATCH_DELAY
+# seconds (or METADATA_BATCH_SIZE messages) and inserted together
+METADATA_BATCH_DELAY = 0.05
+METADATA_BATCH_SIZE = 100
+DATA_TYPE_MAX_LENGTH = EncryptedMetadata._meta.get_field('data_type').max_length
+
+# Last formatted timestamp, reused for NOW_ISO_TTL seconds
+NOW_ISO_TTL = 0.05
+_now_cache = {'t': float('-inf'), 's': ''}
+
+
+def now_iso():
+    """
+    Current time as an ISO 8601 string, refreshed at most every 50ms.
+    
+    Used for connection, pong and error timestamps, where the coarser
+    resolution does not matter and formatting per message adds up.
+    """
+    t = time.monotonic()
+    if t - _now_cache['t'] > NOW_ISO_TTL:
+        _now_cache['t'] = t
+        _now_cache['s'] = timezone.now().isoformat()
+    return _now_cache['s']
+
 
 class NeuroBridgeConsumer(AsyncWebsocketConsumer):
     """
@@ -41,6 +91,17 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
     - session.ended: Confirms session end
     - metadata.synced: Confirms metadata stored
     - error: Error message
+    
+    Wire protocols:
+    - JSON text frames (default)
+    - Protobuf binary frames (stream.proto), when the client requests the
+      'neurobridge.proto' subprotocol; binary fields travel without base64
+    - On JSON connections, metadata.sync may also be sent as a binary
+      metadata frame (see protocol.py) to skip base64
+    
+    Outbound messages queued in the same event-loop tick are sent as one
+    frame: a single JSON object or a JSON array when several coalesce
+    (JSON), or one Frame holding every message (protobuf).
     """
     
     async def connect(self):
@@ -57,6 +118,21 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
             await self.close(code=4001)  # Custom close code for auth failure
             return
         
+        # Outbound messages waiting for the next flush
+        self._outbox = []
+        self._flush_task = None
+        
+        # Sessions known to belong to this user, so metadata writes can
+        # skip the ownership lookup
+        self._owned_sessions = set()
+        
+        # Unsaved metadata waiting for the next batch insert
+        self._pending_meta = []
+        self._meta_flush_task = None
+        
+        # Protobuf if the client asked for it, JSON otherwise
+        self.use_proto = PROTO_SUBPROTOCOL in self.scope.get('subprotocols', [])
+        
         # Create user-specific group for multi-device sync
         self.user_group = f"user_{self.user.id}"
         
@@ -66,8 +142,10 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
+        _local_groups.setdefault(self.user_group, set()).add(self)
+        
         # Accept the connection
-        await self.accept()
+        await self.accept(subprotocol=PROTO_SUBPROTOCOL if self.use_proto else None)
         
         logger.info(f"WebSocket connected: user={self.user.username}")
         
@@ -76,30 +154,69 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
             'type': 'connection.established',
             'user_id': self.user.id,
             'username': self.user.username,
-            'timestamp': timezone.now().isoformat()
+            'timestamp': now_iso()
         })
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
-        if hasattr(self, 'user_group'):
-            await self.channel_layer.group_discard(
-                self.user_group,
-                self.channel_name
+        try:
+            # Buffered metadata was already accepted from the client; store it
+            if getattr(self, '_pending_meta', None):
+                if self._meta_flush_task is not None:
+                    self._meta_flush_task.cancel()
+                    self._meta_flush_task = None
+                pending, self._pending_meta = self._pending_meta, []
+                await self.store_metadata_batch(pending, self.user, self._owned_sessions)
+        except Exception as e:
+            logger.exception(f"Error storing metadata on disconnect: {e}")
+        finally:
+            # Always leave groups, even if the final metadata write failed
+            if hasattr(self, 'user_group'):
+                local = _local_groups.get(self.user_group)
+                if local is not None:
+                    local.discard(self)
+                    if not local:
+                        del _local_groups[self.user_group]
+                
+                await self.channel_layer.group_discard(
+                    self.user_group,
+                    self.channel_name
+                )
+            
+            logger.info(
+                f"WebSocket disconnected: user={getattr(self.user, 'username', 'unknown')}, "
+                f"code={close_code}"
             )
-        
-        logger.info(
-            f"WebSocket disconnected: user={getattr(self.user, 'username', 'unknown')}, "
-            f"code={close_code}"
-        )
+            
+            # Release per-connection state now rather than whenever the
+            # consumer is garbage-collected
+            for name in ('_flush_task', '_meta_flush_task'):
+                task = getattr(self, name, None)
+                if task is not None and not task.done():
+                    task.cancel()
+            self.user = None
+            self._outbox = None
+            self._pending_meta = None
+            self._owned_sessions = None
+            self._flush_task = None
+            self._meta_flush_task = None
     
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
         """
         Handle incoming WebSocket messages.
         
-        All messages should be JSON with a 'type' field.
+        All messages should be JSON with a 'type' field, a protobuf
+        Envelope on 'neurobridge.proto' connections, or a binary metadata
+        frame on JSON connections.
         """
         try:
-            data = json.loads(text_data)
+            if bytes_data is not None:
+                if self.use_proto:
+                    data = decode_envelope(bytes_data)
+                else:
+                    data = decode_binary_frame(bytes_data)
+            else:
+                data = orjson.loads(text_data)
             message_type = data.get('type')
             
             if not message_type:
@@ -107,18 +224,23 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
                 return
             
             # Route to appropriate handler
-            handler = getattr(self, f"handle_{message_type.replace('.', '_')}", None)
+            handler = self.HANDLERS.get(message_type)
             
             if handler:
-                await handler(data)
+                await handler(self, data)
             else:
                 await self.send_error(f"Unknown message type: {message_type}")
                 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             await self.send_error("Invalid JSON")
+        except ProtocolError as e:
+            await self.send_error(str(e))
         except Exception as e:
             logger.exception(f"Error handling WebSocket message: {e}")
             await self.send_error(f"Internal error: {str(e)}")
+        finally:
+            # Everything this message produced goes out as one frame
+            await self._flush()
     
     # ========== Message Handlers ==========
     
@@ -128,26 +250,17 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
         
         Expected data: { type: 'session.start', title?: string }
         """
-        from apps.sessions.models import Session
-        
         title = data.get('title', '')
         session = await self.create_session(title)
+        self._owned_sessions.add(session.id)
         
         await self.send_json({
             'type': 'session.started',
             'session_id': session.id,
-            'started_at': session.started_at.isoformat()
+            'started_at': session.started_at
         })
         
-        # Notify other devices
-        await self.channel_layer.group_send(
-            self.user_group,
-            {
-                'type': 'session_update',
-                'action': 'started',
-                'session_id': session.id
-            }
-        )
+        await self.notify_other_devices('started', session.id)
     
     async def handle_session_end(self, data):
         """
@@ -155,8 +268,6 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
         
         Expected data: { type: 'session.end', session_id: number }
         """
-        from apps.sessions.models import Session
-        
         session_id = data.get('session_id')
         if not session_id:
             await self.send_error("Missing session_id")
@@ -170,15 +281,7 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
                 'session_id': session_id
             })
             
-            # Notify other devices
-            await self.channel_layer.group_send(
-                self.user_group,
-                {
-                    'type': 'session_update',
-                    'action': 'ended',
-                    'session_id': session_id
-                }
-            )
+            await self.notify_other_devices('ended', session_id)
         else:
             await self.send_error("Failed to end session")
     
@@ -189,16 +292,17 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
         Expected data: {
             type: 'metadata.sync',
             session_id: number,
-            encrypted_blob: string (base64),
-            iv: string (base64),
+            encrypted_blob: string (base64; raw bytes over protobuf
+                            or binary frames),
+            iv: string (base64; raw bytes over protobuf or binary frames),
             data_type: string
         }
         
+        Writes are batched: the message is buffered and stored with its
+        neighbours, and one metadata.synced reply lists every stored id.
+        
         PRIVACY: We store this data but CANNOT decrypt it.
         """
-        import base64
-        from apps.sessions.models import EncryptedMetadata, Session
-        
         session_id = data.get('session_id')
         encrypted_blob = data.get('encrypted_blob')
         iv = data.get('iv')
@@ -208,18 +312,41 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
             await self.send_error("Missing required fields for metadata sync")
             return
         
+        # Validate before buffering, so a bad message can't fail the
+        # batch insert for its neighbours
         try:
-            metadata = await self.store_metadata(
-                session_id, encrypted_blob, iv, data_type
-            )
-            
-            await self.send_json({
-                'type': 'metadata.synced',
-                'metadata_id': metadata.id,
-                'timestamp': metadata.created_at.isoformat()
-            })
+            session_id = int(session_id)
+        except (TypeError, ValueError):
+            await self.send_error("Invalid session_id")
+            return
+        if not isinstance(data_type, str) or len(data_type) > DATA_TYPE_MAX_LENGTH:
+            await self.send_error("Invalid data_type")
+            return
+        
+        # Protobuf and binary-frame clients send raw bytes; JSON clients
+        # send base64
+        try:
+            if isinstance(encrypted_blob, str):
+                encrypted_blob = _b64.b64decode(encrypted_blob)
+            if isinstance(iv, str):
+                iv = _b64.b64decode(iv)
         except Exception as e:
             await self.send_error(f"Failed to store metadata: {str(e)}")
+            return
+        
+        self._pending_meta.append(EncryptedMetadata(
+            session_id=session_id,
+            encrypted_blob=encrypted_blob,
+            iv=iv,
+            data_type=data_type
+        ))
+        
+        if len(self._pending_meta) >= METADATA_BATCH_SIZE:
+            if self._meta_flush_task is not None:
+                self._meta_flush_task.cancel()
+            await self._flush_metadata()
+        elif self._meta_flush_task is None:
+            self._meta_flush_task = asyncio.ensure_future(self._flush_metadata_later())
     
     async def handle_presence_ping(self, data):
         """
@@ -229,13 +356,25 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
         """
         await self.send_json({
             'type': 'presence.pong',
-            'timestamp': timezone.now().isoformat()
+            'timestamp': now_iso()
         })
     
+    # Message type -> handler, resolved once at class creation
+    HANDLERS = {
+        'session.start': handle_session_start,
+        'session.end': handle_session_end,
+        'metadata.sync': handle_metadata_sync,
+        'presence.ping': handle_presence_ping,
+    }
+    
     # ========== Group Message Handlers ==========
     
     async def session_update(self, event):
         """Handle session update broadcasts to user group."""
+        # Consumers in the sending process were already notified directly
+        if event.get('origin') == _PROCESS_ID:
+            return
+        
         await self.send_json({
             'type': 'session.update',
             'action': event['action'],
@@ -244,28 +383,119 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
     
     # ========== Helper Methods ==========
     
+    async def notify_other_devices(self, action, session_id):
+        """
+        Broadcast a session update to the user's other connections.
+        
+        Connections in this process are notified directly; the channel
+        layer carries the update to other processes, and this process's
+        consumers (the sender included) drop the copy it delivers back.
+        """
+        event = {
+            'type': 'session_update',
+            'action': action,
+            'session_id': session_id
+        }
+        
+        local = _local_groups.get(self.user_group, ())
+        for consumer in local:
+            if consumer is not self:
+                task = asyncio.create_task(consumer.session_update(event))
+                _local_tasks.add(task)
+                task.add_done_callback(_local_tasks.discard)
+        
+        await self.channel_layer.group_send(
+            self.user_group,
+            {**event, 'origin': _PROCESS_ID}
+        )
+    
     async def send_json(self, data):
-        """Send JSON data to client."""
-        await self.send(text_data=json.dumps(data))
+        """
+        Queue JSON data for the client.
+        
+        The queue is flushed at the end of receive(), or on the next
+        event-loop iteration for messages sent outside of it (e.g. group
+        broadcasts), so bursts cost one frame instead of one per message.
+        Messages produced after disconnect are dropped.
+        """
+        if self._outbox is None:
+            return
+        self._outbox.append(data)
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush())
+    
+    async def _flush(self):
+        """
+        Send all queued messages as a single frame.
+        
+        Frames go straight to the raw ASGI send, skipping the
+        AsyncWebsocketConsumer.send -> AsyncConsumer.send wrappers.
+        """
+        self._flush_task = None
+        if not self._outbox:
+            return
+        
+        outbox, self._outbox = self._outbox, []
+        if self.use_proto:
+            await self.base_send({'type': 'websocket.send', 'bytes': encode_frame(outbox)})
+            return
+        
+        payload = outbox[0] if len(outbox) == 1 else outbox
+        await self.base_send({'type': 'websocket.send', 'text': orjson.dumps(payload).decode()})
+    
+    async def _flush_metadata_later(self):
+        """Store buffered metadata once the batching window closes."""
+        await asyncio.sleep(METADATA_BATCH_DELAY)
+        await self._flush_metadata()
+    
+    async def _flush_metadata(self):
+        """Store buffered metadata and confirm it in one reply."""
+        self._meta_flush_task = None
+        if not self._pending_meta:
+            return
+        
+        pending, self._pending_meta = self._pending_meta, []
+        try:
+            # Pass connection state explicitly: disconnect() may release
+            # it while the batch is still being written
+            stored, rejected = await self.store_metadata_batch(
+                pending, self.user, self._owned_sessions
+            )
+        except Exception as e:
+            logger.exception(f"Error storing metadata batch: {e}")
+            await self.send_error(f"Failed to store metadata: {str(e)}")
+            await self._flush()
+            return
+        
+        if rejected:
+            await self.send_error(
+                f"Failed to store metadata: {rejected} message(s) rejected"
+            )
+        if stored:
+            await self.send_json({
+                'type': 'metadata.synced',
+                'metadata_id': stored[-1].id,
+                'metadata_ids': [metadata.id for metadata in stored],
+                'timestamp': stored[-1].created_at
+            })
+        await self._flush()
     
     async def send_error(self, message):
         """Send error message to client."""
         await self.send_json({
             'type': 'error',
             'message': message,
-            'timestamp': timezone.now().isoformat()
+            'timestamp': now_iso()
         })
     
     @database_sync_to_async
     def create_session(self, title):
         """Create a new session in database."""
-        from apps.sessions.models import Session
         return Session.objects.create(user=self.user, title=title)
     
     @database_sync_to_async
     def end_session(self, session_id):
         """End a session in database."""
-        from apps.sessions.models import Session
         try:
             session = Session.objects.get(id=session_id, user=self.user)
             session.end_session()
@@ -274,16 +504,40 @@ class NeuroBridgeConsumer(AsyncWebsocketConsumer):
             return False
     
     @database_sync_to_async
-    def store_metadata(self, session_id, encrypted_blob, iv, data_type):
-        """Store encrypted metadata in database."""
-        import base64
-        from apps.sessions.models import EncryptedMetadata, Session
+    def store_metadata_batch(self, pending, user, owned_sessions):
+        """
+        Store unsaved EncryptedMetadata instances in one bulk insert.
         
-        session = Session.objects.get(id=session_id, user=self.user)
+        Ownership is checked once per session per connection, with
+        'owned_sessions' updated in place. If the bulk insert fails, rows
+        are retried one by one so a bad row only loses itself. Returns
+        the stored instances and the number rejected (sessions that don't
+        belong to 'user', or rows the database refused).
+        """
+        unknown = {metadata.session_id for metadata in pending} - owned_sessions
+        if unknown:
+            owned_sessions.update(
+                Session.objects.filter(id__in=unknown, user=user)
+                .values_list('id', flat=True)
+            )
         
-        return EncryptedMetadata.objects.create(
-            session=session,
-            encrypted_blob=base64.b64decode(encrypted_blob),
-            iv=base64.b64decode(iv),
-            data_type=data_type
-        )
+        stored = [m for m in pending if m.session_id in owned_sessions]
+        # bulk_create() bypasses save()
+        for metadata in stored:
+            metadata.refresh_blob_b64()
+        try:
+            # Atomic, so the per-row retry never duplicates earlier chunks
+            with transaction.atomic():
+                EncryptedMetadata.objects.bulk_create(stored, batch_size=METADATA_BATCH_SIZE)
+        except DatabaseError:
+            logger.exception("Bulk metadata insert failed; retrying per row")
+            saved = []
+            for metadata in stored:
+                try:
+                    metadata.save()
+                except DatabaseError:
+                    continue
+                saved.append(metadata)
+            stored = saved
+        
+        return stored, len(pending) - len(stored)
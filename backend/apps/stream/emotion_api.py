@@ -2,72 +2,133 @@
 Emotion Analysis API - Local FER+ ONNX Model
 
 Uses the FER+ (Facial Expression Recognition Plus) ONNX model
-stored locally in backend/models/ for emotion detection.
+stored locally in backend/models/ for emotion detection, with faces
+located by a CenterFace ONNX detector.
 
-Model: emotion-ferplus-8.onnx (~35MB)
+Model: emotion-ferplus-8.int8.onnx (~9MB, INT8 quantized from emotion-ferplus-8.onnx)
 Input: 64x64 grayscale face image
 Output: 8 emotions with confidence scores
 
+Face detector: face_detector.onnx (CenterFace, ~7MB)
+Input: 320x256 frame, grayscale replicated to 3 channels
+Output: face center heatmap, box sizes and offsets (4x downsampled)
+
 PRIVACY: All processing happens locally. Frames are never stored.
 """
 
+import asyncio
 import base64
 import logging
 import os
+import threading
 from typing import Optional
 
 import cv2
 import numpy as np
+import orjson
 from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 import onnxruntime as ort
 
 logger = logging.getLogger(__name__)
 
-# Models (lazy loaded)
-_face_cascade = None
+# Models (loaded by warm_up() at ASGI startup, or lazily on first use)
+_face_session = None
+_face_input_name = None
+_face_output_names = None
 _emotion_session = None
+_emotion_input_name = None
 
 # FER+ emotion labels (in order of model output)
 EMOTIONS = ['neutral', 'happiness', 'surprise', 'sadness', 'anger', 'disgust', 'fear', 'contempt']
 
 # Model paths
 MODEL_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'models')
-EMOTION_MODEL_PATH = os.path.abspath(os.path.join(MODEL_DIR, 'emotion-ferplus-8.onnx'))
+EMOTION_MODEL_PATH = os.path.abspath(os.path.join(MODEL_DIR, 'emotion-ferplus-8.int8.onnx'))
+FACE_MODEL_PATH = os.path.abspath(os.path.join(MODEL_DIR, 'face_detector.onnx'))
+
+# Face detector input (width, height); CenterFace needs multiples of 32
+FACE_INPUT_SIZE = (320, 256)
+FACE_SCORE_THRESHOLD = 0.5
+FACE_NMS_THRESHOLD = 0.3
+
+# Preferred execution providers; ORT falls through to CPU
+ONNX_PROVIDERS = ['OpenVINOExecutionProvider', 'DnnlExecutionProvider', 'CPUExecutionProvider']
+
+# Micro-batching: faces from concurrent requests share one session.run
+BATCH_MAX_SIZE = 16
+BATCH_MAX_DELAY = 0.010  # seconds
+
+
+def _session_options() -> ort.SessionOptions:
+    """ONNX Runtime options shared by the face and emotion models."""
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = os.cpu_count() or 1
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    return options
+
+
+def _load_session(path: str, label: str) -> ort.InferenceSession:
+    """Create an ONNX Runtime session on the best available provider."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"{label} model not found: {path}\n"
+            "See backend/models/README.md to download and quantize it"
+        )
+    
+    logger.info(f"Loading {label.lower()} model: {path}")
+    available = ort.get_available_providers()
+    session = ort.InferenceSession(
+        path,
+        sess_options=_session_options(),
+        providers=[p for p in ONNX_PROVIDERS if p in available]
+    )
+    logger.info(f"{label} model loaded successfully ({session.get_providers()[0]})")
+    return session
 
 
 def get_face_detector():
-    """Get OpenCV Haar cascade face detector."""
-    global _face_cascade
-    if _face_cascade is None:
-        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        _face_cascade = cv2.CascadeClassifier(cascade_path)
-        logger.info("Face detector loaded (OpenCV Haar cascade)")
-    return _face_cascade
+    """Load CenterFace ONNX face detection model."""
+    global _face_session, _face_input_name, _face_output_names
+    if _face_session is None:
+        _face_session = _load_session(FACE_MODEL_PATH, 'Face detector')
+        _face_input_name = _face_session.get_inputs()[0].name
+        # Heatmap, scale and offset; the landmarks output is not needed
+        _face_output_names = [o.name for o in _face_session.get_outputs()[:3]]
+    return _face_session
 
 
 def get_emotion_model():
     """Load FER+ ONNX emotion classification model."""
-    global _emotion_session
+    global _emotion_session, _emotion_input_name
     if _emotion_session is None:
-        if not os.path.exists(EMOTION_MODEL_PATH):
-            raise FileNotFoundError(
-                f"Emotion model not found: {EMOTION_MODEL_PATH}\n"
-                "Please download from: https://github.com/onnx/models/raw/main/validated/vision/body_analysis/emotion_ferplus/model/emotion-ferplus-8.onnx"
-            )
-        
-        logger.info(f"Loading emotion model: {EMOTION_MODEL_PATH}")
-        _emotion_session = ort.InferenceSession(
-            EMOTION_MODEL_PATH,
-            providers=['CPUExecutionProvider']
-        )
-        logger.info("Emotion model loaded successfully (FER+ ONNX)")
+        _emotion_session = _load_session(EMOTION_MODEL_PATH, 'Emotion')
+        # Resolve once instead of reflecting on every inference
+        _emotion_input_name = _emotion_session.get_inputs()[0].name
     return _emotion_session
 
 
+def warm_up():
+    """
+    Load the face detector and emotion model ahead of the first request.
+    
+    Called at ASGI startup so no request pays for model loading. Failures
+    are logged rather than raised so the rest of the server still starts;
+    /api/emotion/health/ reports the problem.
+    """
+    try:
+        get_face_detector()
+        get_emotion_model()
+    except Exception as e:
+        logger.error(f"Emotion model warm-up failed: {e}")
+
+
 def decode_base64_image(base64_string: str) -> Optional[np.ndarray]:
-    """Decode base64 image to OpenCV BGR format."""
+    """Decode base64 image straight to grayscale (the whole pipeline is gray)."""
     try:
         # Remove data URL prefix if present
         if ',' in base64_string:
@@ -75,46 +136,247 @@ def decode_base64_image(base64_string: str) -> Optional[np.ndarray]:
         
         image_bytes = base64.b64decode(base64_string)
         nparr = np.frombuffer(image_bytes, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        image = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
         return image
     except Exception as e:
         logger.error(f"Failed to decode image: {e}")
         return None
 
 
-def preprocess_face_for_fer(face_bgr: np.ndarray) -> np.ndarray:
+# Per-thread scratch arrays (softmax output, face detector input, FER+
+# resize), reused across inferences
+_buffers = threading.local()
+
+
+def softmax(x, out=None):
+    """Compute softmax values (into out, if given)."""
+    out = np.subtract(x, x.max(), out=out)
+    np.exp(out, out=out)
+    out /= out.sum()
+    return out
+
+
+def _probs_buffer() -> np.ndarray:
+    buf = getattr(_buffers, 'probs', None)
+    if buf is None:
+        buf = _buffers.probs = np.empty(len(EMOTIONS), np.float32)
+    return buf
+
+
+def _face_blob() -> np.ndarray:
+    width, height = FACE_INPUT_SIZE
+    blob = getattr(_buffers, 'face_blob', None)
+    if blob is None:
+        blob = _buffers.face_blob = np.empty((1, 3, height, width), np.float32)
+    return blob
+
+
+def _fer_resized() -> np.ndarray:
+    resized = getattr(_buffers, 'fer_resized', None)
+    if resized is None:
+        resized = _buffers.fer_resized = np.empty((64, 64), np.uint8)
+    return resized
+
+
+def preprocess_face_for_fer(face_gray: np.ndarray) -> np.ndarray:
     """
-    Preprocess face for FER+ model.
+    Preprocess a grayscale face ROI for FER+ model.
     
     FER+ expects:
     - 64x64 grayscale image
-    - Float32 normalized
+    - Float32 pixel values (the INT8 graph quantizes its own input)
     - Shape: (1, 1, 64, 64) - NCHW format
+    
+    The returned tensor is freshly allocated: it waits in the batcher's
+    queue while this thread moves on to other requests.
     """
-    # Convert to grayscale
-    gray = cv2.cvtColor(face_bgr, cv2.COLOR_BGR2GRAY)
+    # Resize to 64x64 into per-thread scratch, then cast into the NCHW
+    # tensor (batch, channels, height, width)
+    tensor = np.empty((1, 1, 64, 64), np.float32)
+    tensor[0, 0] = cv2.resize(face_gray, (64, 64), dst=_fer_resized())
     
-    # Resize to 64x64
-    resized = cv2.resize(gray, (64, 64))
+    return tensor
+
+
+def run_emotion_model(faces: np.ndarray) -> np.ndarray:
+    """Run the emotion model on an (N, 1, 64, 64) batch, returning (N, 8) logits."""
+    session = get_emotion_model()
+    return session.run(None, {_emotion_input_name: faces})[0]
+
+
+def detect_faces(image: np.ndarray) -> np.ndarray:
+    """
+    Detect faces in a grayscale image.
     
-    # Normalize to float32
-    normalized = resized.astype(np.float32)
+    Returns an (N, 4) array of (x, y, w, h) boxes in image pixels.
+    """
+    session = get_face_detector()
+    width, height = FACE_INPUT_SIZE
     
-    # Reshape to NCHW: (batch, channels, height, width)
-    tensor = normalized.reshape(1, 1, 64, 64)
+    # Gray frame replicated into the 3 input channels
+    blob = _face_blob()
+    blob[0, :] = cv2.resize(image, FACE_INPUT_SIZE)
+    heatmap, scale, offset = session.run(_face_output_names, {_face_input_name: blob})
     
-    return tensor
+    ys, xs = np.nonzero(heatmap[0, 0] > FACE_SCORE_THRESHOLD)
+    if len(ys) == 0:
+        return np.empty((0, 4), np.float32)
+    
+    # Decode centers and sizes (output stride 4) back to image pixels
+    box_h = np.exp(scale[0, 0, ys, xs]) * 4
+    box_w = np.exp(scale[0, 1, ys, xs]) * 4
+    x1 = (xs + offset[0, 1, ys, xs] + 0.5) * 4 - box_w / 2
+    y1 = (ys + offset[0, 0, ys, xs] + 0.5) * 4 - box_h / 2
+    sx, sy = image.shape[1] / width, image.shape[0] / height
+    boxes = np.stack([x1 * sx, y1 * sy, box_w * sx, box_h * sy], axis=1)
+    
+    keep = cv2.dnn.NMSBoxes(
+        boxes.tolist(), heatmap[0, 0, ys, xs].tolist(),
+        FACE_SCORE_THRESHOLD, FACE_NMS_THRESHOLD
+    )
+    return boxes[np.asarray(keep, dtype=np.intp).ravel()]
+
+
+def extract_face(image: np.ndarray) -> Optional[np.ndarray]:
+    """Detect the largest face in a grayscale image and return its FER+ tensor, or None."""
+    faces = detect_faces(image)
+    
+    if len(faces) == 0:
+        return None
+    
+    # Get largest face, clipped to the frame
+    x, y, w, h = faces[(faces[:, 2] * faces[:, 3]).argmax()]
+    x0, y0 = max(int(x), 0), max(int(y), 0)
+    x1, y1 = min(int(x + w), image.shape[1]), min(int(y + h), image.shape[0])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    
+    # Extract and preprocess face
+    face_roi = image[y0:y1, x0:x1]
+    return preprocess_face_for_fer(face_roi)
+
+
+def _emotion_result(logits: Optional[np.ndarray]) -> dict:
+    """Build the analysis result from one face's logits (None: no face)."""
+    if logits is None:
+        return {
+            'emotion': 'neutral',
+            'confidence': 0.0,
+            'face_detected': False,
+            'all_emotions': {}
+        }
+    
+    # Softmax is monotonic, so the top emotion comes straight from the logits
+    top_idx = int(logits.argmax())
+    
+    probs = softmax(logits, out=_probs_buffer()).tolist()
+    
+    return {
+        'emotion': EMOTIONS[top_idx],
+        'confidence': probs[top_idx],
+        'face_detected': True,
+        'all_emotions': dict(zip(EMOTIONS, probs))
+    }
 
 
-def softmax(x):
-    """Compute softmax values."""
-    exp_x = np.exp(x - np.max(x))
-    return exp_x / exp_x.sum()
+def _error_result(e: Exception) -> dict:
+    """Build the analysis result for a failed inference."""
+    if isinstance(e, FileNotFoundError):
+        logger.error(str(e))
+        error = 'Model not found'
+    else:
+        logger.exception(f"Emotion analysis error: {e}")
+        error = str(e)
+    return {
+        'emotion': 'neutral',
+        'confidence': 0.0,
+        'face_detected': False,
+        'error': error
+    }
 
 
-def analyze_emotion(image: np.ndarray) -> dict:
+class EmotionBatcher:
     """
-    Detect face and analyze emotion.
+    Collects face tensors from concurrent requests and runs them through
+    the emotion model as one (N, 1, 64, 64) batch.
+    
+    A batch is flushed when BATCH_MAX_SIZE faces are waiting or
+    BATCH_MAX_DELAY after its first face, whichever comes first. The
+    worker task starts on first use in the server's event loop; inference
+    runs in the default executor so the loop keeps serving requests.
+    """
+    
+    def __init__(self, max_size: int = BATCH_MAX_SIZE, max_delay: float = BATCH_MAX_DELAY):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._queue = None
+        self._full = None
+        self._worker = None
+        # Faces the worker has already taken off the queue for the batch
+        # it is collecting
+        self._held = 0
+        # Batch input, reused by the (single) worker task
+        self._faces = np.empty((max_size, 1, 64, 64), np.float32)
+    
+    def _ensure_worker(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._full = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+        return loop
+    
+    async def infer(self, face_tensor: np.ndarray) -> np.ndarray:
+        """Return the logits for one (1, 1, 64, 64) face tensor."""
+        loop = self._ensure_worker()
+        future = loop.create_future()
+        self._queue.put_nowait((face_tensor, future))
+        if self._queue.qsize() + self._held >= self.max_size:
+            self._full.set()
+        return await future
+    
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        self._held = 1
+        if self._queue.qsize() < self.max_size - 1:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+        self._held = 0
+        self._full.clear()
+        while len(batch) < self.max_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            faces = np.concatenate(
+                [face for face, _ in batch], axis=0, out=self._faces[:len(batch)]
+            )
+            try:
+                logits = await loop.run_in_executor(None, run_emotion_model, faces)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), row in zip(batch, logits):
+                if not future.done():
+                    future.set_result(row)
+
+
+_batcher = EmotionBatcher()
+
+
+async def analyze_emotion_batched(image: np.ndarray) -> dict:
+    """
+    Detect face and analyze emotion in a grayscale image.
+    
+    Face detection runs in a worker thread and the emotion model call is
+    micro-batched with concurrent requests.
     
     Returns dict with:
     - emotion: dominant emotion string
@@ -123,78 +385,17 @@ def analyze_emotion(image: np.ndarray) -> dict:
     - all_emotions: dict of all emotion scores
     """
     try:
-        # Detect faces
-        detector = get_face_detector()
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        faces = detector.detectMultiScale(
-            gray,
-            scaleFactor=1.1,
-            minNeighbors=5,
-            minSize=(48, 48)
-        )
-        
-        if len(faces) == 0:
-            return {
-                'emotion': 'neutral',
-                'confidence': 0.0,
-                'face_detected': False,
-                'all_emotions': {}
-            }
-        
-        # Get largest face
-        faces = sorted(faces, key=lambda f: f[2] * f[3], reverse=True)
-        x, y, w, h = faces[0]
-        
-        # Extract and preprocess face
-        face_roi = image[y:y+h, x:x+w]
-        face_tensor = preprocess_face_for_fer(face_roi)
-        
-        # Run emotion model
-        session = get_emotion_model()
-        input_name = session.get_inputs()[0].name
-        outputs = session.run(None, {input_name: face_tensor})
-        
-        # Get probabilities
-        logits = outputs[0][0]
-        probs = softmax(logits)
-        
-        # Build emotion scores dict
-        all_emotions = {EMOTIONS[i]: float(probs[i]) for i in range(len(EMOTIONS))}
-        
-        # Get top emotion
-        top_idx = np.argmax(probs)
-        top_emotion = EMOTIONS[top_idx]
-        top_confidence = float(probs[top_idx])
-        
-        return {
-            'emotion': top_emotion,
-            'confidence': top_confidence,
-            'face_detected': True,
-            'all_emotions': all_emotions
-        }
-        
-    except FileNotFoundError as e:
-        logger.error(str(e))
-        return {
-            'emotion': 'neutral',
-            'confidence': 0.0,
-            'face_detected': False,
-            'error': 'Model not found'
-        }
+        face_tensor = await asyncio.to_thread(extract_face, image)
+        if face_tensor is None:
+            return _emotion_result(None)
+        return _emotion_result(await _batcher.infer(face_tensor))
     except Exception as e:
-        logger.exception(f"Emotion analysis error: {e}")
-        return {
-            'emotion': 'neutral',
-            'confidence': 0.0,
-            'face_detected': False,
-            'error': str(e)
-        }
+        return _error_result(e)
 
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def analyze_emotion_view(request):
+@csrf_exempt
+@require_POST
+async def analyze_emotion_view(request):
     """
     API endpoint to analyze emotion from base64 image.
     
@@ -207,16 +408,21 @@ def analyze_emotion_view(request):
         "face_detected": true,
         "all_emotions": { "neutral": 0.05, "happiness": 0.87, ... }
     }
+    
+    Async so concurrent requests can share one batched model call.
     """
-    image_data = request.data.get('image')
+    try:
+        image_data = orjson.loads(request.body).get('image')
+    except (orjson.JSONDecodeError, AttributeError):
+        image_data = None
     if not image_data:
         return JsonResponse({'error': 'No image provided'}, status=400)
     
-    image = decode_base64_image(image_data)
+    image = await asyncio.to_thread(decode_base64_image, image_data)
     if image is None:
         return JsonResponse({'error': 'Failed to decode image'}, status=400)
     
-    result = analyze_emotion(image)
+    result = await analyze_emotion_batched(image)
     
     return JsonResponse({
         'emotion': result['emotion'],
@@ -10,8 +10,14 @@ SECURITY NOTES:
 - Token in query params is visible in server logs - use HTTPS in production
 - Consider implementing short-lived WebSocket-specific tokens for production
 - Token validation happens only on connect, not per-message (performance)
+- Validated tokens are cached for up to TOKEN_CACHE_MAX_AGE, so reconnects
+  skip the decode and the user query. Saving or deleting a user bumps a
+  per-user version that invalidates its cached tokens (see signals.py)
 """
 
+import hashlib
+import time
+
 import jwt
 from urllib.parse import parse_qs
 from channels.db import database_sync_to_async
@@ -19,16 +25,66 @@ from channels.middleware import BaseMiddleware
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
 
 User = get_user_model()
 
+TOKEN_CACHE_PREFIX = 'ws_jwt:'
+USER_VERSION_PREFIX = 'ws_jwt_user:'
+
+# How long a validated token is trusted without a DB check. Bounds
+# staleness where invalidation can't reach (e.g. a user deleted from
+# another process with the default local-memory cache).
+TOKEN_CACHE_MAX_AGE = 300
+
+
+class CachedTokenUser(SimpleLazyObject):
+    """
+    User for a token that was already validated and cached.
+    
+    id, pk, username and is_authenticated come from the cache entry, which
+    covers what the consumer reads on connect; any other attribute loads
+    the User row on first access.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    
+    def __init__(self, user_id, username):
+        super().__init__(lambda: User.objects.get(id=user_id))
+        # Bypass LazyObject.__setattr__, which would load the user
+        self.__dict__['id'] = self.__dict__['pk'] = user_id
+        self.__dict__['username'] = username
+
+
+def _token_cache_key(token: str) -> str:
+    return TOKEN_CACHE_PREFIX + hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def _user_version_key(user_id) -> str:
+    return f"{USER_VERSION_PREFIX}{user_id}"
+
+
+def invalidate_user_tokens(user_id):
+    """
+    Invalidate every cached token for a user.
+    
+    Cached entries record the user's version when they were stored and
+    only count as hits while it is unchanged. The new version outlives
+    every entry stored before it, since entries expire within
+    TOKEN_CACHE_MAX_AGE.
+    """
+    cache.set(_user_version_key(user_id), time.time_ns(), timeout=TOKEN_CACHE_MAX_AGE)
+
 
 @database_sync_to_async
-def get_user_from_token(token: str):
+def validate_token(token: str, cache_key: str):
     """
     Validate JWT token and return the associated user.
     
-    Returns AnonymousUser if token is invalid or expired.
+    Returns AnonymousUser if token is invalid or expired. Valid tokens are
+    cached as (user_id, username, exp, user_version) until they expire,
+    for at most TOKEN_CACHE_MAX_AGE.
     """
     try:
         # Decode the token using Django's secret key
@@ -43,7 +99,18 @@ def get_user_from_token(token: str):
         if user_id is None:
             return AnonymousUser()
         
+        # Read the version before the user, so an invalidation in between
+        # makes this entry stale rather than being missed
+        version = cache.get(_user_version_key(user_id), 0)
         user = User.objects.get(id=user_id)
+        
+        exp = payload.get('exp')
+        if exp:
+            cache.set(
+                cache_key,
+                (user.id, user.username, exp, version),
+                timeout=min(exp - time.time(), TOKEN_CACHE_MAX_AGE)
+            )
         return user
         
     except jwt.ExpiredSignatureError:
@@ -57,6 +124,28 @@ def get_user_from_token(token: str):
         return AnonymousUser()
 
 
+async def get_user_from_token(token: str):
+    """
+    Return the user for a JWT token, skipping decode and DB fetch if the
+    token was validated before.
+    
+    The cache is read inline rather than through a thread hop; with the
+    default local-memory cache this is a dict lookup.
+    """
+    cache_key = _token_cache_key(token)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        user_id, username, exp, version = cached
+        # Entries expire with the token, but check in case the cache lags
+        if exp <= time.time():
+            return AnonymousUser()
+        # Saved or deleted since caching: validate against the DB again
+        if cache.get(_user_version_key(user_id), 0) == version:
+            return CachedTokenUser(user_id, username)
+    
+    return await validate_token(token, cache_key)
+
+
 class JWTAuthMiddleware(BaseMiddleware):
     """
     Middleware that authenticates WebSocket connections using JWT.
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: apps/stream/proto/stream.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'apps/stream/proto/stream.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1e\x61pps/stream/proto/stream.proto\x12\x12neurobridge.stream\"\x1d\n\x0cSessionStart\x12\r\n\x05title\x18\x01 \x01(\t\" \n\nSessionEnd\x12\x12\n\nsession_id\x18\x01 \x01(\x03\"Y\n\x0cMetadataSync\x12\x12\n\nsession_id\x18\x01 \x01(\x03\x12\x16\n\x0e\x65ncrypted_blob\x18\x02 \x01(\x0c\x12\n\n\x02iv\x18\x03 \x01(\x0c\x12\x11\n\tdata_type\x18\x04 \x01(\t\"\x0e\n\x0cPresencePing\"M\n\x15\x43onnectionEstablished\x12\x0f\n\x07user_id\x18\x01 \x01(\x03\x12\x10\n\x08username\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\t\"8\n\x0eSessionStarted\x12\x12\n\nsession_id\x18\x01 \x01(\x03\x12\x12\n\nstarted_at\x18\x02 \x01(\t\"\"\n\x0cSessionEnded\x12\x12\n\nsession_id\x18\x01 \x01(\x03\"3\n\rSessionUpdate\x12\x0e\n\x06\x61\x63tion\x18\x01 \x01(\t\x12\x12\n\nsession_id\x18\x02 \x01(\x03\"N\n\x0eMetadataSynced\x12\x13\n\x0bmetadata_id\x18\x01 \x01(\x03\x12\x11\n\ttimestamp\x18\x02 \x01(\t\x12\x14\n\x0cmetadata_ids\x18\x03 \x03(\x03\"!\n\x0cPresencePong\x12\x11\n\ttimestamp\x18\x01 \x01(\t\"+\n\x05\x45rror\x12\x0f\n\x07message\x18\x01 \x01(\t\x12\x11\n\ttimestamp\x18\x02 \x01(\t\"\xa7\x05\n\x08\x45nvelope\x12\x39\n\rsession_start\x18\x01 \x01(\x0b\x32 .neurobridge.stream.SessionStartH\x00\x12\x35\n\x0bsession_end\x18\x02 \x01(\x0b\x32\x1e.neurobridge.stream.SessionEndH\x00\x12\x39\n\rmetadata_sync\x18\x03 \x01(\x0b\x32 .neurobridge.stream.MetadataSyncH\x00\x12\x39\n\rpresence_ping\x18\x04 \x01(\x0b\x32 .neurobridge.stream.PresencePingH\x00\x12K\n\x16\x63onnection_established\x18\x10 \x01(\x0b\x32).neurobridge.stream.ConnectionEstablishedH\x00\x12=\n\x0fsession_started\x18\x11 \x01(\x0b\x32\".neurobridge.stream.SessionStartedH\x00\x12\x39\n\rsession_ended\x18\x12 \x01(\x0b\x32 .neurobridge.stream.SessionEndedH\x00\x12;\n\x0esession_update\x18\x13 \x01(\x0b\x32!.neurobridge.stream.SessionUpdateH\x00\x12=\n\x0fmetadata_synced\x18\x14 \x01(\x0b\x32\".neurobridge.stream.MetadataSyncedH\x00\x12\x39\n\rpresence_pong\x18\x15 \x01(\x0b\x32 .neurobridge.stream.PresencePongH\x00\x12*\n\x05\x65rror\x18\x16 \x01(\x0b\x32\x19.neurobridge.stream.ErrorH\x00\x42\t\n\x07payload\"7\n\x05\x46rame\x12.\n\x08messages\x18\x01 \x03(\x0b\x32\x1c.neurobridge.stream.Envelopeb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'apps.stream.proto.stream_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_SESSIONSTART']._serialized_start=54
+  _globals['_SESSIONSTART']._serialized_end=83
+  _globals['_SESSIONEND']._serialized_start=85
+  _globals['_SESSIONEND']._serialized_end=117
+  _globals['_METADATASYNC']._serialized_start=119
+  _globals['_METADATASYNC']._serialized_end=208
+  _globals['_PRESENCEPING']._serialized_start=210
+  _globals['_PRESENCEPING']._serialized_end=224
+  _globals['_CONNECTIONESTABLISHED']._serialized_start=226
+  _globals['_CONNECTIONESTABLISHED']._serialized_end=303
+  _globals['_SESSIONSTARTED']._serialized_start=305
+  _globals['_SESSIONSTARTED']._serialized_end=361
+  _globals['_SESSIONENDED']._serialized_start=363
+  _globals['_SESSIONENDED']._serialized_end=397
+  _globals['_SESSIONUPDATE']._serialized_start=399
+  _globals['_SESSIONUPDATE']._serialized_end=450
+  _globals['_METADATASYNCED']._serialized_start=452
+  _globals['_METADATASYNCED']._serialized_end=530
+  _globals['_PRESENCEPONG']._serialized_start=532
+  _globals['_PRESENCEPONG']._serialized_end=565
+  _globals['_ERROR']._serialized_start=567
+  _globals['_ERROR']._serialized_end=610
+  _globals['_ENVELOPE']._serialized_start=613
+  _globals['_ENVELOPE']._serialized_end=1292
+  _globals['_FRAME']._serialized_start=1294
+  _globals['_FRAME']._serialized_end=1349
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,106 @@
+"""
+Binary wire protocols for the NeuroBridge WebSocket.
+
+Protobuf: clients opt in by requesting the PROTO_SUBPROTOCOL WebSocket
+subprotocol. Frames are translated to and from the same message dicts the
+JSON protocol uses ({'type': 'session.start', ...}), so consumer handlers
+are protocol-agnostic. Binary fields (encrypted_blob, iv) stay as raw bytes.
+
+Binary metadata frames: JSON connections may send metadata.sync as a
+binary frame instead of base64 inside JSON:
+
+    | u8 type=0x01 | u32 session_id | u16 iv_len | u8 data_type_len |
+    | iv | data_type (UTF-8) | encrypted_blob ... |
+
+Integers are little-endian; an empty data_type means 'general'.
+"""
+
+import struct
+from datetime import datetime
+
+from google.protobuf.message import DecodeError
+
+from .proto.stream_pb2 import Envelope, Frame
+
+PROTO_SUBPROTOCOL = 'neurobridge.proto'
+
+# Envelope oneof field -> JSON message type ('session_start' -> 'session.start')
+_ENVELOPE_TYPES = {
+    field.name: field.name.replace('_', '.', 1)
+    for field in Envelope.DESCRIPTOR.oneofs_by_name['payload'].fields
+}
+_ENVELOPE_FIELDS = {message_type: field for field, message_type in _ENVELOPE_TYPES.items()}
+
+BINARY_METADATA_SYNC = 0x01
+_BINARY_HEADER = struct.Struct('<BIHB')
+
+
+class ProtocolError(ValueError):
+    """Raised for frames that aren't a valid Envelope or binary frame."""
+
+
+def decode_envelope(raw):
+    """Decode a client Envelope into a message dict."""
+    try:
+        envelope = Envelope.FromString(raw)
+    except DecodeError as e:
+        raise ProtocolError("Invalid protobuf frame") from e
+    
+    field = envelope.WhichOneof('payload')
+    if field is None:
+        return {}
+    
+    data = {f.name: value for f, value in getattr(envelope, field).ListFields()}
+    data['type'] = _ENVELOPE_TYPES[field]
+    return data
+
+
+def encode_frame(messages):
+    """Encode server message dicts into one serialized Frame."""
+    frame = Frame()
+    for message in messages:
+        fields = dict(message)
+        payload = getattr(frame.messages.add(), _ENVELOPE_FIELDS[fields.pop('type')])
+        for name, value in fields.items():
+            if value is None:
+                continue
+            # Timestamps are datetimes (orjson encodes them for JSON)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            if isinstance(value, list):
+                getattr(payload, name).extend(value)
+            else:
+                setattr(payload, name, value)
+        # Mark empty payloads (e.g. presence.pong without fields) as set
+        payload.SetInParent()
+    return frame.SerializeToString()
+
+
+def decode_binary_frame(raw):
+    """Decode a binary metadata frame into a metadata.sync message dict."""
+    if len(raw) < _BINARY_HEADER.size:
+        raise ProtocolError("Invalid binary frame")
+    
+    frame_type, session_id, iv_len, data_type_len = _BINARY_HEADER.unpack_from(raw)
+    if frame_type != BINARY_METADATA_SYNC:
+        raise ProtocolError(f"Unknown binary frame type: {frame_type:#04x}")
+    
+    iv_end = _BINARY_HEADER.size + iv_len
+    blob_start = iv_end + data_type_len
+    if blob_start > len(raw):
+        raise ProtocolError("Invalid binary frame")
+    
+    # Slices of the frame itself, no copies
+    view = memoryview(raw)
+    try:
+        data_type = str(view[iv_end:blob_start], 'utf-8')
+    except UnicodeDecodeError as e:
+        raise ProtocolError("Invalid binary frame") from e
+    
+    return {
+        'type': 'metadata.sync',
+        'session_id': session_id,
+        'iv': view[_BINARY_HEADER.size:iv_end],
+        'data_type': data_type or 'general',
+        'encrypted_blob': view[blob_start:],
+    }
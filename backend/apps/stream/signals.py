@@ -0,0 +1,21 @@
+"""
+Signal handlers for the stream app.
+
+Keep the WebSocket JWT cache (middleware.py) in step with the users it
+vouches for.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .middleware import invalidate_user_tokens
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_tokens(sender, instance, **kwargs):
+    """Drop cached tokens when a user is changed (e.g. deactivated) or deleted."""
+    invalidate_user_tokens(instance.pk)
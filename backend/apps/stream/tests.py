@@ -0,0 +1,55 @@
+"""
+Tests for the stream app.
+"""
+
+import asyncio
+import time
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from . import emotion_api
+
+
+def _fake_model(batch_sizes):
+    """Stand-in for run_emotion_model that records each batch size."""
+    def run(faces):
+        batch_sizes.append(len(faces))
+        return np.zeros((len(faces), len(emotion_api.EMOTIONS)), np.float32)
+    return run
+
+
+class EmotionBatcherTests(SimpleTestCase):
+    """Flush behaviour of EmotionBatcher, with the model stubbed out."""
+
+    MAX_DELAY = 0.5
+
+    async def _run_staggered(self, count):
+        batcher = emotion_api.EmotionBatcher(max_size=4, max_delay=self.MAX_DELAY)
+        face = np.zeros((1, 1, 64, 64), np.float32)
+
+        async def request(i):
+            # Stagger arrivals so the worker starts collecting first
+            await asyncio.sleep(i * 0.001)
+            await batcher.infer(face)
+
+        start = time.monotonic()
+        await asyncio.gather(*(request(i) for i in range(count)))
+        return time.monotonic() - start
+
+    async def test_full_batch_flushes_without_waiting(self):
+        batch_sizes = []
+        with mock.patch.object(emotion_api, 'run_emotion_model', _fake_model(batch_sizes)):
+            elapsed = await self._run_staggered(4)
+
+        self.assertEqual(batch_sizes, [4])
+        self.assertLess(elapsed, self.MAX_DELAY / 2)
+
+    async def test_partial_batch_waits_for_delay(self):
+        batch_sizes = []
+        with mock.patch.object(emotion_api, 'run_emotion_model', _fake_model(batch_sizes)):
+            elapsed = await self._run_staggered(3)
+
+        self.assertEqual(batch_sizes, [3])
+        self.assertGreaterEqual(elapsed, self.MAX_DELAY)
@@ -19,6 +19,10 @@ django_asgi_app = get_asgi_application()
 # Import after Django setup to avoid AppRegistryNotReady
 from apps.stream.routing import websocket_urlpatterns
 from apps.stream.middleware import JWTAuthMiddleware
+from apps.stream.emotion_api import warm_up
+
+# Load the emotion models now rather than inside the first request
+warm_up()
 
 application = ProtocolTypeRouter({
     # HTTP requests are handled by Django's ASGI application
@@ -76,33 +76,48 @@ export function useWebSocket(): UseWebSocketReturn {
     }, []);
 
     /**
-     * Handle incoming messages
+     * Route a single message to its handlers
      */
-    const handleMessage = useCallback((event: MessageEvent) => {
-        try {
-            const data = JSON.parse(event.data) as WebSocketMessage;
-            const type = data.type;
+    const dispatchMessage = useCallback((data: WebSocketMessage) => {
+        const type = data.type;
 
-            if (!type) {
-                console.warn('[WS] Received message without type:', data);
-                return;
-            }
+        if (!type) {
+            console.warn('[WS] Received message without type:', data);
+            return;
+        }
 
-            // Route to handlers
-            const handlers = handlersRef.current.get(type);
-            if (handlers) {
-                handlers.forEach((handler) => handler(data));
-            }
+        // Route to handlers
+        const handlers = handlersRef.current.get(type);
+        if (handlers) {
+            handlers.forEach((handler) => handler(data));
+        }
+
+        // Also call wildcard handlers
+        const wildcardHandlers = handlersRef.current.get('*');
+        if (wildcardHandlers) {
+            wildcardHandlers.forEach((handler) => handler(data));
+        }
+    }, []);
+
+    /**
+     * Handle incoming frames
+     *
+     * The server coalesces bursts into one frame, sent as a JSON array
+     * when it holds more than one message.
+     */
+    const handleMessage = useCallback((event: MessageEvent) => {
+        try {
+            const data = JSON.parse(event.data) as WebSocketMessage | WebSocketMessage[];
 
-            // Also call wildcard handlers
-            const wildcardHandlers = handlersRef.current.get('*');
-            if (wildcardHandlers) {
-                wildcardHandlers.forEach((handler) => handler(data));
+            if (Array.isArray(data)) {
+                data.forEach(dispatchMessage);
+            } else {
+                dispatchMessage(data);
             }
         } catch (err) {
             console.error('[WS] Message parse error:', err);
         }
-    }, []);
+    }, [dispatchMessage]);
 
     /**
      * Connect to the WebSocket server